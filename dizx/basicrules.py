@@ -1,6 +1,6 @@
 from . import Edge, CliffordPhase
 from .graph.base import BaseGraph, VT, ET
-from .utils import VertexType
+from .utils import VertexType, mod_inverse
 
 
 def check_remove_parallel_edge_between_zs(
@@ -131,7 +131,7 @@ def check_z_elim(g: BaseGraph[VT, ET], v: VT) -> bool:
                 and (edge1.had + edge2.had) % g.dim == 0
         ) or (
                 (et1, et2) == (Edge.SimpleEdge, Edge.SimpleEdge)
-                and (edge1.simple - pow(edge2.simple, -1, g.dim)) % g.dim == 0
+                and (edge1.simple - mod_inverse(edge2.simple, g.dim)) % g.dim == 0
                 and g.type(v1) in xb and g.type(v2) in xb
         )
 
@@ -156,7 +156,7 @@ def z_elim(g: BaseGraph[VT, ET], v: VT) -> bool:
             and (edge1.had + edge2.had) % g.dim == 0:
         g.add_edge(g.edge(v1, v2), Edge.make(g.dim, simple=1))
     elif (et1, et2) == (Edge.SimpleEdge, Edge.SimpleEdge)\
-            and (edge1.simple - pow(edge2.simple, -1, g.dim)) % g.dim == 0\
+            and (edge1.simple - mod_inverse(edge2.simple, g.dim)) % g.dim == 0\
             and g.type(v1) in xb and g.type(v2) in xb:
         g.add_edge(g.edge(v1, v2), Edge.make(g.dim, simple=1))
     else:
@@ -23,7 +23,7 @@ import string
 import random
 from typing import Dict, List, Tuple, Optional, Iterable, Any
 
-from matplotlib import lines, path, patches
+from matplotlib import collections, path, patches
 from typing_extensions import Literal
 
 from IPython.display import display, HTML
@@ -67,46 +67,58 @@ def draw_matplotlib(
     ax = fig1.add_axes([0, 0, 1, 1], frameon=False)
     ax.xaxis.set_visible(False)
     ax.yaxis.set_visible(False)
+    row_of = {v: g.row(v) for v in g.vertices()}
+    ty = g.types()
     vs_on_row: Dict[FloatInt, int] = {} # count the vertices on each row
-    for v in g.vertices():
-        vs_on_row[g.row(v)] = vs_on_row.get(g.row(v), 0) + 1
+    for r in row_of.values():
+        vs_on_row[r] = vs_on_row.get(r, 0) + 1
     
     #Dict[VT,Tuple[FloatInt,FloatInt]]
-    layout = {v:(g.row(v),-g.qubit(v)) for v in g.vertices()}
+    layout = {v:(row_of[v],-g.qubit(v)) for v in g.vertices()}
 
     if rows is not None:
         minrow,maxrow = rows
-        vertices: Iterable[VT] = [v for v in g.vertices() if (minrow<=g.row(v) and g.row(v) <=maxrow)]
-        edges: Iterable[ET] = [e for e in g.edges() if g.edge_s(e) in vertices and g.edge_t(e) in vertices]
+        vertices: Iterable[VT] = [v for v in g.vertices() if (minrow<=row_of[v] and row_of[v] <=maxrow)]
+        vertex_set = set(vertices)
+        edges: Iterable[ET] = [e for e in g.edges() if g.edge_s(e) in vertex_set and g.edge_t(e) in vertex_set]
     else:
         vertices = g.vertices()
         edges = g.edges()
     
+    # Collect the primitives first and add them to the axes in a few
+    # collections, as one artist per edge/vertex is very slow for big graphs.
+    straight_segments: List[Any] = []
+    straight_colors: List[str] = []
+    bent_patches: List[patches.Patch] = []
+    h_boxes: List[patches.Patch] = []
+    blue_h_edges = h_edge_draw == 'blue'
+    boxed_h_edges = h_edge_draw == 'box'
     for e in edges:
-        sp = layout[g.edge_s(e)]
-        tp = layout[g.edge_t(e)]
-        et = g.edge_t(e)
-        n_row = vs_on_row.get(g.row(g.edge_s(e)), 0)
+        s, t = g.edge_st(e)
+        sp = layout[s]
+        tp = layout[t]
+        n_row = vs_on_row.get(row_of[s], 0)
 
         
         dx = tp[0] - sp[0]
         dy = tp[1] - sp[1]
-        bend_wire = (dx == 0) and h_edge_draw == 'blue' and n_row > 2
-        ecol = '#0099ff' if h_edge_draw == 'blue' and et == 2 else 'black'
+        is_h_edge = g.edge_object(e).is_had_edge()
+        bend_wire = blue_h_edges and dx == 0 and n_row > 2
+        ecol = '#0099ff' if blue_h_edges and is_h_edge else 'black'
 
         if bend_wire:
             bend = 0.25
             mid = (sp[0] + 0.5 * dx + bend * dy, sp[1] + 0.5 * dy - bend * dx)
 
             pth = path.Path([sp,mid,tp], [path.Path.MOVETO, path.Path.CURVE3, path.Path.LINETO])
-            patch = patches.PathPatch(pth, edgecolor=ecol, linewidth=0.8, fill=False)
-            ax.add_patch(patch)
+            bent_patches.append(patches.PathPatch(pth, edgecolor=ecol, linewidth=0.8, fill=False))
         else:
             pos = 0.5 if dx == 0 or dy == 0 else 0.4
             mid = (sp[0] + pos*dx, sp[1] + pos*dy)
-            ax.add_line(lines.Line2D([sp[0],tp[0]],[sp[1],tp[1]], color=ecol, linewidth=0.8, zorder=0))
+            straight_segments.append((sp, tp))
+            straight_colors.append(ecol)
 
-        if h_edge_draw == 'box' and et == 2: #hadamard edge
+        if boxed_h_edges and is_h_edge: #hadamard edge
             w = 0.2
             h = 0.15
             diag = math.sqrt(w*w+h*h)
@@ -114,28 +126,39 @@ def draw_matplotlib(
             angle2 = math.atan2(h,w)
             centre = (mid[0] - diag/2*math.cos(angle+angle2),
                       mid[1] - diag/2*math.sin(angle+angle2))
-            ax.add_patch(patches.Rectangle(centre,w,h,angle=angle/math.pi*180,facecolor='yellow',edgecolor='black'))
+            h_boxes.append(patches.Rectangle(centre,w,h,angle=angle/math.pi*180,facecolor='yellow',edgecolor='black'))
 
         #plt.plot([sp[0],tp[0]],[sp[1],tp[1]], 'k', zorder=0, linewidth=0.8)
-    
+
+    if straight_segments:
+        ax.add_collection(collections.LineCollection(straight_segments, colors=straight_colors, linewidths=0.8, zorder=0))
+    if bent_patches:
+        ax.add_collection(collections.PatchCollection(bent_patches, match_original=True))
+    if h_boxes:
+        ax.add_collection(collections.PatchCollection(h_boxes, match_original=True))
+
+    circles: List[patches.Patch] = []
     for v in vertices:
         p = layout[v]
-        t = g.type(v)
+        t = ty[v]
         a = g.phase(v)
         a_offset = 0.5
 
         if t == VertexType.Z:
-            ax.add_patch(patches.Circle(p, 0.2, facecolor='green', edgecolor='black', zorder=1))
+            circles.append(patches.Circle(p, 0.2, facecolor='green', edgecolor='black'))
         elif t == VertexType.X:
-            ax.add_patch(patches.Circle(p, 0.2, facecolor='red', edgecolor='black', zorder=1))
+            circles.append(patches.Circle(p, 0.2, facecolor='red', edgecolor='black'))
         else:
-            ax.add_patch(patches.Circle(p, 0.1, facecolor='black', edgecolor='black', zorder=1))
+            circles.append(patches.Circle(p, 0.1, facecolor='black', edgecolor='black'))
 
         if labels: plt.text(p[0]+0.25, p[1]+0.25, str(v), ha='center', color='gray', fontsize=5)
         # if a: plt.text(p[0], p[1]-a_offset, phase_to_s(a, t), ha='center', color='blue', fontsize=8)
+
+    if circles:
+        ax.add_collection(collections.PatchCollection(circles, match_original=True, zorder=1))
     
     if show_scalar:
-        x = min((g.row(v) for v in g.vertices()), default = 0)
+        x = min(row_of.values(), default = 0)
         y = -sum((g.qubit(v) for v in g.vertices()))/(g.num_vertices()+1)
         ax.text(x-5,y,g.scalar.to_latex())
 
@@ -149,6 +172,21 @@ def draw_matplotlib(
 # make sure we get a fresh random seed
 random_graphid = random.Random()
 
+# strips the brackets from the string representation of a phase
+_phase_strip = str.maketrans('', '', '()')
+
+# contents of the javascript files used by draw_d3, keyed by their path
+_javascript_cache: Dict[str, str] = {}
+
+def _load_javascript(name: str) -> str:
+    """Returns the contents of the given file in ``settings.javascript_location``,
+    only reading it from disk the first time it is requested."""
+    fname = os.path.join(settings.javascript_location, name)
+    if fname not in _javascript_cache:
+        with open(fname, 'r') as f:
+            _javascript_cache[fname] = f.read()
+    return _javascript_cache[fname]
+
 # def init_drawing() -> None:
 #     if settings.mode not in ("notebook", "browser"): return
 #
@@ -169,10 +207,23 @@ def draw_d3(
     # use an 8-digit random alphanum instead.
     graph_id = ''.join(random_graphid.choice(string.ascii_letters + string.digits) for _ in range(8))
 
-    minrow = min([g.row(v) for v in g.vertices()], default=0)
-    maxrow = max([g.row(v) for v in g.vertices()], default=0)
-    minqub = min([g.qubit(v) for v in g.vertices()], default=0)
-    maxqub = max([g.qubit(v) for v in g.vertices()], default=0)
+    # Fetch the vertex data in bulk instead of going through the getters for every vertex
+    rs = g.rows()
+    qs = g.qubits()
+    ty = g.types()
+    ph = g.phases()
+
+    minrow = maxrow = minqub = maxqub = 0
+    for i, v in enumerate(g.vertices()):
+        r, q = rs.get(v, -1), qs.get(v, -1)
+        if i == 0:
+            minrow = maxrow = r
+            minqub = maxqub = q
+            continue
+        if r < minrow: minrow = r
+        elif r > maxrow: maxrow = r
+        if q < minqub: minqub = q
+        elif q > maxqub: maxqub = q
 
     if scale is None:
         scale = 800 / (maxrow-minrow + 2)
@@ -185,37 +236,43 @@ def draw_d3(
     w = (maxrow-minrow + 2) * scale
     h = (maxqub-minqub + 3) * scale
 
-    nodes = [{'name': str(v),
-              'x': (g.row(v)-minrow + 1) * scale,
-              'y': (g.qubit(v)-minqub + 2) * scale,
-              't': g.type(v),
-              'phase': str(g.phase(v)).replace('(','').replace(')','').replace('0,0',''),
+    names = {v: str(v) for v in g.vertices()}
+    nodes = [{'name': names[v],
+              'x': (rs.get(v, -1)-minrow + 1) * scale,
+              'y': (qs.get(v, -1)-minqub + 2) * scale,
+              't': ty[v],
+              'phase': str(ph[v]).translate(_phase_strip).replace('0,0',''),
               }
              for v in g.vertices()]
 
     links = []
+    # There are only a handful of distinct edge objects, so compute the
+    # node type and label of each one only once.
+    edge_styles: Dict[Tuple[int,int], Tuple[int,str]] = {}
     for e in g.edges():
         s,t = g.edge_st(e)
-        name = "{}, {}".format(str(s),str(t))
+        s_name, t_name = names[s], names[t]
         eo = g.edge_object(e)
-        phase = str(int(eo))
-        ty = 3 if eo.type() == Edge.HadEdge else 4
-        if ty == 4 and phase == '1':  # It is just a regular edge, so we are not gonna do anything fancy
-            links.append({'source': str(s), 'target': str(t), 't':1})
+        key = eo.to_tuple()
+        if key not in edge_styles:
+            edge_styles[key] = (3 if eo.type() == Edge.HadEdge else 4, str(int(eo)))
+        ety, phase = edge_styles[key]
+        if ety == 4 and phase == '1':  # It is just a regular edge, so we are not gonna do anything fancy
+            links.append({'source': s_name, 'target': t_name, 't':1})
         else:  # We are going to add a dummy H-box-like thing so that we don't have to draw multiple parallel wires
-            x = (0.5*(g.row(s) + g.row(t))-minrow + 1) * scale
-            y = (0.5*(g.qubit(s) + g.qubit(t))-minqub + 2) * scale
+            name = "{}, {}".format(s_name,t_name)
+            x = (0.5*(rs.get(s, -1) + rs.get(t, -1))-minrow + 1) * scale
+            y = (0.5*(qs.get(s, -1) + qs.get(t, -1))-minqub + 2) * scale
             if phase == '1': phase = ''
-            nodes.append({'name': name, 'x': x, 'y': y, 't': ty, 'phase': phase})
-            links.append({'source':str(s), 'target': name, 't':1})
-            links.append({'source':name, 'target': str(t), 't':1})
+            nodes.append({'name': name, 'x': x, 'y': y, 't': ety, 'phase': phase})
+            links.extend(({'source':s_name, 'target': name, 't':1},
+                          {'source':name, 'target': t_name, 't':1}))
     # links = [{'source': str(g.edge_s(e)),
     #           'target': str(g.edge_t(e)),
     #           't': str(g.edge_object(e).type()) } for e in g.edges()]
-    graphj = json.dumps({'nodes': nodes, 'links': links})
+    graphj = json.dumps({'nodes': nodes, 'links': links}, separators=(',',':'))
 
-    with open(os.path.join(settings.javascript_location, 'zx_viewer.inline.js'), 'r') as f:
-        library_code = f.read() + '\n'
+    library_code = _load_javascript('zx_viewer.inline.js') + '\n'
 
     text = """<div style="overflow:auto" id="graph-output-{id}"></div>
 <script type="module">
@@ -2,6 +2,7 @@ from dizx.circuit import Circuit
 from dizx.utils import settings
 
 import random
+import numpy as np
 
 
 def CNOT_HAD_PHASE_circuit(
@@ -28,20 +29,32 @@ def CNOT_HAD_PHASE_circuit(
 
     """
     p_cnot = 1-p_had-p_t
+    # p_had + p_t can miss 1 by a rounding error, e.g. 0.7 + 0.3
+    if abs(p_cnot) < 1e-9: p_cnot = 0.0
+    if p_cnot > 0 and qudits < 2:
+        raise ValueError(f"CNOT gates need at least 2 qudits, got {qudits}. "
+                         "Set p_had + p_t = 1 for a circuit without CNOTs.")
     c = Circuit(qudits)
-    for _ in range(depth):
-        r = random.random()
+    # Draw all the random numbers up front. The generator is seeded from
+    # ``random`` so that ``random.seed`` still makes the output reproducible.
+    rng = np.random.default_rng(random.getrandbits(64))
+    rs = rng.random(depth)
+    tgts = rng.integers(qudits, size=depth).tolist()
+    # controls are drawn from the qudits other than the target, see below.
+    # With a single qudit there are none, and no CNOT is drawn either.
+    if qudits > 1:
+        ctrls = rng.integers(qudits-1, size=depth).tolist()
+    else:
+        ctrls = [0] * depth
+    for r, tgt, ctrl in zip(rs, tgts, ctrls):
         if r > 1-p_had:
-            c.add_gate("HAD",random.randrange(qudits))
-        elif r > 1-p_had-p_t:
-            if not clifford: c.add_gate("T",random.randrange(qudits))
+            c.add_gate("HAD",tgt)
+        elif r >= p_cnot:  # so that no CNOT is drawn when p_cnot == 0
+            if not clifford: c.add_gate("T",tgt)
             else:
-                for _ in range(random.randrange(c.dim)):
-                    c.add_gate("S",random.randrange(qudits))
+                for q in rng.integers(qudits, size=rng.integers(c.dim)).tolist():
+                    c.add_gate("S",q)
         else:
-            tgt = random.randrange(qudits)
-            while True:
-                ctrl = random.randrange(qudits)
-                if ctrl!=tgt: break
+            if ctrl >= tgt: ctrl += 1
             c.add_gate("CNOT",tgt,ctrl)
     return c
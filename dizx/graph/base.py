@@ -17,6 +17,8 @@
 import math
 import itertools
 
+import numpy as np
+
 from ..utils import VertexType, FloatInt
 from .edge import Edge
 from .phase import Phase
@@ -26,46 +28,38 @@ from .phase import Phase, CliffordPhase
 from .edge import Edge
 
 from typing import TYPE_CHECKING, Union, Optional, Generic, TypeVar, Any, Sequence
-from typing import List, Dict, Set, Tuple, Mapping, Iterable, Callable, ClassVar
-from typing_extensions import Literal, GenericMeta # type: ignore # https://github.com/python/mypy/issues/5753
-
-
-class DocstringMeta(GenericMeta):
-    """Metaclass that allows docstring 'inheritance'."""
-
-    def __new__(mcls, classname, bases, cls_dict, **kwargs):
-        cls = GenericMeta.__new__(mcls, classname, bases, cls_dict, **kwargs)
-        mro = cls.__mro__[1:]
-        for name, member in cls_dict.items():
-            if not getattr(member, '__doc__'):
-                for base in mro:
-                    try:
-                        member.__doc__ = getattr(base, name).__doc__
-                        break
-                    except AttributeError:
-                        pass
-        return cls
+from typing import List, Set, Tuple, Mapping, Iterable, Callable, ClassVar
+from typing_extensions import Literal
+
+
+def inherit_docstrings(cls):
+    """Class decorator that allows docstring 'inheritance'."""
+    mro = cls.__mro__[1:]
+    for name, member in cls.__dict__.items():
+        if not getattr(member, '__doc__'):
+            for base in mro:
+                try:
+                    member.__doc__ = getattr(base, name).__doc__
+                    break
+                except AttributeError:
+                    pass
+    return cls
 
 def pack_indices(lst: List[FloatInt]) -> Mapping[FloatInt,int]:
-    d: Dict[FloatInt,int] = dict()
-    if len(lst) == 0: return d
-    list.sort(lst)
-    i: int = 0
-    x: Optional[FloatInt] = None
-    for j in range(len(lst)):
-        y = lst[j]
-        if y != x:
-            x = y
-            d[y] = i
-            i += 1
-    return d
+    """Maps every distinct value in ``lst`` to its rank among these values."""
+    if len(lst) == 0: return dict()
+    # np.unique turns a mix of ints and floats into floats, so the keys are
+    # taken from ``lst`` itself, at the first occurrence of each value
+    _, first = np.unique(lst, return_index=True)
+    return {lst[i]: rank for rank, i in enumerate(first.tolist())}
 
 
 VT = TypeVar('VT', bound=int) # The type that is used for representing vertices (e.g. an integer)
 ET = TypeVar('ET') # The type used for representing edges (e.g. a pair of integers)
 
 
-class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
+@inherit_docstrings
+class BaseGraph(Generic[VT, ET]):
     """Base class for letting graph backends interact with PyZX.
     For a backend to work with PyZX, there should be a class that implements
     all the methods of this class. For implementations of this class see 
@@ -115,33 +109,36 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
         qs = self.qubits()
         rs = self.rows()
         maxr = self.depth()
-        vtab = dict()
 
+        vertices = list(self.vertices())
         if adjoint:
-            for i in ph: ph[i] = ph[i].adjoint()
-
-        for v in self.vertices():
-            i = g.add_vertex(ty[v],phase=ph[v])
-            if v in qs: g.set_qubit(i,qs[v])
-            if v in rs:
-                if adjoint: g.set_row(i, maxr-rs[v])
-                else: g.set_row(i, rs[v])
-            vtab[v] = i
-
-
-        new_inputs = tuple(vtab[i] for i in self.inputs())
-        new_outputs = tuple(vtab[i] for i in self.outputs())
-        if not adjoint:
-            g.set_inputs(new_inputs)
-            g.set_outputs(new_outputs)
+            phases = [ph[v].adjoint() for v in vertices]
+            rows = [maxr-rs[v] if v in rs else -1 for v in vertices]
         else:
-            g.set_inputs(new_outputs)
-            g.set_outputs(new_inputs)
-
-        etab = {e:g.edge(vtab[self.edge_s(e)],vtab[self.edge_t(e)]) for e in self.edges()}
-        g.add_edges(etab.values())
-        for e,f in etab.items():
-            g.set_edge_object(f, self.edge_object(e))
+            phases = [ph[v] for v in vertices]
+            rows = [rs.get(v,-1) for v in vertices]
+        new_vertices = g.add_vertices_bulk(
+            [ty[v] for v in vertices], phases,
+            [qs.get(v,-1) for v in vertices], rows)
+        # Vertices are integers below vindex(), so a list works as lookup table
+        vtab: List[Any] = [None] * self.vindex()
+        for v, w in zip(vertices, new_vertices):
+            vtab[v] = w
+
+        ins, outs = self.inputs(), self.outputs()
+        if adjoint: ins, outs = outs, ins
+        g.set_inputs(tuple([vtab[i] for i in ins]))
+        g.set_outputs(tuple([vtab[o] for o in outs]))
+
+        edges = []
+        for e in self.edges():
+            s, t = self.edge_st(e)
+            edges.append((g.edge(vtab[s],vtab[t]), self.edge_object(e)))
+        # edges() leaves out self-loops, so those are copied separately
+        for v in vertices:
+            if self.connected(v, v):
+                edges.append((g.edge(vtab[v],vtab[v]), self.edge_object(self.edge(v,v))))
+        g.add_edges_with_objects(edges)
         return g
 
     def adjoint(self) -> 'BaseGraph':
@@ -183,10 +180,11 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
 
     def pack_circuit_rows(self) -> None:
         """Compresses the rows of the graph so that every index is used."""
-        rows = [self.row(v) for v in self.vertices()]
+        vertices = list(self.vertices())
+        rows = [self.row(v) for v in vertices]
         new_rows = pack_indices(rows)
-        for v in self.vertices():
-            self.set_row(v, new_rows[self.row(v)])
+        for v, r in zip(vertices, rows):
+            self.set_row(v, new_rows[r])
 
     def qubit_count(self) -> int:
         """Returns the number of inputs of the graph"""
@@ -201,14 +199,16 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
             for o in self.outputs():
                 self.set_row(o,4)
             max_r = self.depth() -1
-        claimed = []
-        for q,i in enumerate(sorted(self.inputs(), key=self.qubit)):
+        claimed = set()
+        ty = self.types()
+        qs = self.qubits()
+        for q,i in enumerate(sorted(self.inputs(), key=lambda v: qs.get(v,-1))):
             self.set_row(i,0)
             self.set_qubit(i,q)
             #q = self.qubit(i)
-            n = list(self.neighbors(i))[0]
-            if self.type(n) in (VertexType.Z, VertexType.X):
-                claimed.append(n)
+            n = next(iter(self.neighbors(i)))
+            if ty[n] in (VertexType.Z, VertexType.X):
+                claimed.add(n)
                 self.set_row(n,1)
                 self.set_qubit(n, q)
             # else: #directly connected to output
@@ -219,11 +219,12 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
             #     self.add_edge(self.edge(i,v),toggle_edge(t))
             #     self.add_edge(self.edge(v,n),EdgeType.HADAMARD)
             #     claimed.append(v)
-        for q, o in enumerate(sorted(self.outputs(),key=self.qubit)):
+        qs = self.qubits()
+        for q, o in enumerate(sorted(self.outputs(),key=lambda v: qs.get(v,-1))):
             #q = self.qubit(o)
             self.set_row(o,max_r+1)
             self.set_qubit(o,q)
-            n = list(self.neighbors(o))[0]
+            n = next(iter(self.neighbors(o)))
             if n not in claimed:
                 self.set_row(n,max_r)
                 self.set_qubit(n, q)
@@ -278,13 +279,31 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
         v = self.add_vertices(1)[0]
         self.set_type(v, ty)
         if phase is None:
-            phase = CliffordPhase(self.dim)
+            phase = CliffordPhase.zero(self.dim)
         self.set_qubit(v, qubit)
         self.set_row(v, row)
         if phase:
             self.set_phase(v, phase)
         return v
 
+    def add_vertices_bulk(self,
+                          types: Sequence[VertexType.Type],
+                          phases: Sequence[Phase],
+                          qubits: Sequence[FloatInt],
+                          rows: Sequence[FloatInt]
+                          ) -> Sequence[VT]:
+        """Add a vertex for every entry of the given sequences, which should all
+        have the same length, and return the indices of the new vertices.
+        Backends should override this if they can set the data of many
+        vertices at once more cheaply than through :meth:`add_vertex`."""
+        vs = self.add_vertices(len(types))
+        for v, t, p, q, r in zip(vs, types, phases, qubits, rows):
+            self.set_type(v, t)
+            self.set_phase(v, p)
+            self.set_qubit(v, q)
+            self.set_row(v, r)
+        return vs
+
     def add_edges(self, edges: Iterable[ET], edge_object: Edge) -> None:
         """Adds a list of edges to the graph."""
         raise NotImplementedError("Not implemented on backend " + type(self).backend)
@@ -293,6 +312,13 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
         """Adds a single edge of the given type"""
         self.add_edges([edge], edge_object)
 
+    def add_edges_with_objects(self, edges: Iterable[Tuple[ET, Edge]]) -> None:
+        """Adds the given edges with their own edge objects. The edges should not
+        yet be present in the graph. Unlike :meth:`add_edge` the edge objects are
+        stored as they are, so this is meant for copying the edges of another graph."""
+        for e, eo in edges:
+            self.set_edge_object(e, eo)
+
 
     def remove_vertices(self, vertices: Iterable[VT]) -> None:
         """Removes the list of vertices from the graph."""
@@ -304,27 +330,27 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
 
     def remove_isolated_vertices(self) -> None:
         """Deletes all vertices and vertex pairs that are not connected to any other vertex."""
-        rem: List[VT] = []
+        rem: Set[VT] = set()
+        ty = self.types()
         for v in self.vertices():
             d = self.vertex_degree(v)
             if d == 0:
-                rem.append(v)
-                ty = self.type(v)
-                if ty == VertexType.BOUNDARY:
+                rem.add(v)
+                if ty[v] == VertexType.BOUNDARY:
                     raise TypeError("Diagram is not a well-typed ZX-diagram: contains isolated boundary vertex.")
                 else: self.scalar.add_node(self.phase(v))
             if d == 1: # It has a unique neighbor
                 if v in rem: continue # Already taken care of
-                if self.type(v) == VertexType.BOUNDARY: continue # Ignore in/outputs
-                w = list(self.neighbors(v))[0]
-                if len(list(self.neighbors(w))) > 1: continue # But this neighbor has other neighbors
-                if self.type(w) == VertexType.BOUNDARY: continue # It's a state/effect
+                if ty[v] == VertexType.BOUNDARY: continue # Ignore in/outputs
+                w = next(iter(self.neighbors(v)))
+                if self.vertex_degree(w) > 1: continue # But this neighbor has other neighbors
+                if ty[w] == VertexType.BOUNDARY: continue # It's a state/effect
                 # At this point w and v are only connected to each other
-                rem.append(v)
-                rem.append(w)
+                rem.add(v)
+                rem.add(w)
                 et = self.edge_object(self.edge(v, w))
-                t1 = self.type(v)
-                t2 = self.type(w)
+                t1 = ty[v]
+                t2 = ty[w]
                 if t1==t2:
                     if et.is_simple_edge():
                         self.scalar.add_node(self.phase(v)+self.phase(w))
@@ -17,18 +17,29 @@
 """This file contains the Edge class used to represent the edges between two
 nodes in a Graph."""
 
+import functools
+
 
 class Edge(object):
     SimpleEdge = 1
     HadEdge = 2
 
+    __slots__ = ('_had', '_simple')
+
     def __init__(self, had=0, simple=0):
         self._had = had
         self._simple = simple
 
     @classmethod
     def make(cls, dim, had=0, simple=0):
-        return cls(had=had % dim, simple=simple % dim)
+        return cls.get(had % dim, simple % dim)
+
+    @staticmethod
+    def get(had=0, simple=0):
+        """Returns a shared Edge with the given amount of Hadamard and simple
+        edges. Edges are never modified in place, so they can be reused
+        freely; there are only dim*dim different reduced edges."""
+        return _shared_edge(had, simple)
 
     @property
     def had(self) -> int:
@@ -39,42 +50,65 @@ class Edge(object):
         return self._simple
 
     def is_edge_present(self) -> bool:
-        return self.had != 0 or self.simple != 0
+        return self._had != 0 or self._simple != 0
 
     def is_had_edge(self) -> bool:
-        return self.is_edge_present() and self.simple == 0
+        return self._had != 0 and self._simple == 0
 
     def is_simple_edge(self) -> bool:
-        return self.is_edge_present() and self.had == 0
+        return self._simple != 0 and self._had == 0
 
     def is_reduced(self) -> bool:
-        return self.had == 0 or self.simple == 0
+        return self._had == 0 or self._simple == 0
 
     def type(self) -> int:
-        if not self.is_reduced():
+        if self._had != 0 and self._simple != 0:
             raise ValueError(
                 "This edge is not in reduced form, so it doesn't have a definitive type")
-        return Edge.SimpleEdge if self.had == 0 else Edge.HadEdge
+        return Edge.SimpleEdge if self._had == 0 else Edge.HadEdge
 
     def is_single(self) -> bool:
-        return int(self) == 1
+        return self._had + self._simple == 1
 
     def to_tuple(self):
-        return self.had, self.simple
+        return self._had, self._simple
 
     def __add__(self, edge2):
-        return Edge(self.dim, self.had + edge2.had,
-                    self.simple + edge2.simple)
+        # Edges don't know their dimension, so the sum is not reduced.
+        # Use Edge.make to reduce it modulo the dimension of the graph.
+        return Edge.get(self._had + edge2._had, self._simple + edge2._simple)
+
+    def __eq__(self, other):
+        if not isinstance(other, Edge):
+            return NotImplemented
+        return self._had == other._had and self._simple == other._simple
+
+    def __lt__(self, other):
+        if not isinstance(other, Edge):
+            return NotImplemented
+        if self._had != other._had:
+            return self._had < other._had
+        return self._simple < other._simple
+
+    def __hash__(self):
+        # Edge counts are small, so this is collision free in practice
+        return (self._had << 16) ^ self._simple
 
     def __bool__(self):
-        return self.is_edge_present()
+        return self._had != 0 or self._simple != 0
 
     def __int__(self):
-        return self.had + self.simple
+        return self._had + self._simple
 
     def __str__(self):
-        return f"Edge(h={self.had},s={self.simple})"
+        return f"Edge(h={self._had},s={self._simple})"
 
     def __repr__(self):
         return str(self)
 
+
+# lru_cache keys positional and keyword calls differently, so Edge.get always
+# passes both arguments positionally to get a single instance per edge.
+@functools.lru_cache(maxsize=None)
+def _shared_edge(had, simple, /):
+    return Edge(had=had, simple=simple)
@@ -22,7 +22,13 @@ from .graph_s import GraphS
 
 backends = { 'simple': True}
 
-def Graph(dim):
+def Graph(dim, backend:Optional[str]=None) -> BaseGraph:
+	"""Returns an instance of an implementation of :class:`~dizx.graph.base.BaseGraph`
+	working on qudits of dimension ``dim``. Currently the only ``backend`` is
+	`simple`, which is also the default."""
+	if backend is None: backend = 'simple'
+	if backend not in backends:
+		raise KeyError("Unavailable backend '{}'".format(backend))
 	return GraphS(dim)
 
 # def Graph(backend:Optional[str]=None) -> BaseGraph:
@@ -14,7 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .base import BaseGraph
+from .base import BaseGraph, inherit_docstrings
 
 from ..utils import VertexType, FloatInt
 
@@ -25,6 +25,10 @@ from typing import Tuple, Dict, List
 
 from typing import Tuple, Dict
 
+_NO_EDGE = Edge.get()
+_NO_NEIGHBOURS: Dict[int, Edge] = {}
+
+@inherit_docstrings
 class GraphS(BaseGraph[int,Tuple[int,int]]):
     """Purely Pythonic implementation of :class:`~graph.base.BaseGraph`."""
     backend = 'simple'
@@ -42,14 +46,16 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
         self._maxq: FloatInt                            = -1
         self._rindex: Dict[int, FloatInt]               = dict()
         self._maxr: FloatInt                            = -1
+        # Set when the vertex holding the maximum was moved down or removed
+        self._maxq_dirty: bool                          = False
+        self._maxr_dirty: bool                          = False
 
         self._inputs: Tuple[int, ...]                   = tuple()
         self._outputs: Tuple[int, ...]                  = tuple()
         
     def clone(self) -> 'GraphS':
-        cpy = GraphS()
-        for v, d in self.graph.items():
-            cpy.graph[v] = d.copy()
+        cpy = GraphS(self.dim)
+        cpy.graph = {v: d.copy() for v, d in self.graph.items()}
         cpy._vindex = self._vindex
         cpy.nedges = self.nedges
         cpy.ty = self.ty.copy()
@@ -58,25 +64,23 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
         cpy._maxq = self._maxq
         cpy._rindex = self._rindex.copy()
         cpy._maxr = self._maxr
-        cpy._vdata = self._vdata.copy()
+        cpy._maxq_dirty = self._maxq_dirty
+        cpy._maxr_dirty = self._maxr_dirty
         cpy.scalar = self.scalar.copy()
-        cpy._inputs = tuple(list(self._inputs))
-        cpy._outputs = tuple(list(self._outputs))
-        cpy.track_phases = self.track_phases
-        cpy.phase_index = self.phase_index.copy()
-        cpy.phase_master = self.phase_master
-        cpy.phase_mult = self.phase_mult.copy()
-        cpy.max_phase_index = self.max_phase_index
+        cpy._inputs = self._inputs  # tuples are immutable, so they can be shared
+        cpy._outputs = self._outputs
         return cpy
 
     def vindex(self): return self._vindex
     def depth(self): 
-        if self._rindex: self._maxr = max(self._rindex.values())
-        else: self._maxr = -1
+        if self._maxr_dirty:
+            self._maxr = max(self._rindex.values(), default=-1)
+            self._maxr_dirty = False
         return self._maxr
     def qubit_count(self): 
-        if self._qindex: self._maxq = max(self._qindex.values())
-        else: self._maxq = -1
+        if self._maxq_dirty:
+            self._maxq = max(self._qindex.values(), default=-1)
+            self._maxq_dirty = False
         return self._maxq + 1
 
     def inputs(self):
@@ -101,11 +105,30 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
         for i in range(self._vindex, self._vindex + amount):
             self.graph[i] = dict()
             self.ty[i] = VertexType.BOUNDARY
-            self._phase[i] = CliffordPhase(self.dim)
+            self._phase[i] = CliffordPhase.zero(self.dim)
         self._vindex += amount
         return range(self._vindex - amount, self._vindex)
 
 
+    def add_vertices_bulk(self, types, phases, qubits, rows):
+        vs = range(self._vindex, self._vindex + len(types))
+        for v in vs:
+            self.graph[v] = dict()
+        self.ty.update(zip(vs, types))
+        self._phase.update(zip(vs, phases))
+        self._qindex.update(zip(vs, qubits))
+        self._rindex.update(zip(vs, rows))
+        self._maxq = max(self._maxq, max(qubits, default=-1))
+        self._maxr = max(self._maxr, max(rows, default=-1))
+        self._vindex += len(types)
+        return vs
+
+    def add_edges_with_objects(self, edges):
+        for (v1,v2), eo in edges:
+            self.graph[v1][v2] = eo
+            self.graph[v2][v1] = eo
+            if v1 != v2: self.nedges += 1
+
     def add_edges(self, edges:List[Tuple[int,int]],eo: Edge):
         for e in edges:
             # self.nedges += 1
@@ -115,123 +138,137 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
 
     def add_edge(self, e:Tuple[int,int], eo: Edge):
         v1,v2 = e
-        t1,t2 = self.type(v1), self.type(v2)
         old = self.edge_object(e)
-        if t1 == VertexType.BOUNDARY or t2 == VertexType.BOUNDARY:
-            if old:  # There was already an edge present
-                raise ValueError("Trying to add an edge to a boundary while there is already an edge present")
-            if not eo.is_single():
-                raise ValueError("Can't add compound edge to boundary vertex")
-            self.graph[v1][v2] = eo
-            self.graph[v2][v1] = eo
-            self.nedges += 1
+        adder = GraphS._edge_adders.get((self.ty[v1], self.ty[v2]), GraphS._add_edge_zx)
+        adder(self, v1, v2, eo, old)
+
+    def _add_edge_boundary(self, v1, v2, eo, old):
+        if old:  # There was already an edge present
+            raise ValueError("Trying to add an edge to a boundary while there is already an edge present")
+        if not eo.is_single():
+            raise ValueError("Can't add compound edge to boundary vertex")
+        self.graph[v1][v2] = eo
+        self.graph[v2][v1] = eo
+        if v1 != v2: self.nedges += 1
+
+    def _add_edge_zz(self, v1, v2, eo, old):
+        # Both spiders are Z-spiders
+        if eo.simple != 0 or old.simple != 0: # We have some amount of simple edges, so the spiders 'fuse' and we can get rid of any H-edges
+            h = (old.had + eo.had) % self.dim
+            self.add_to_phase(v1,CliffordPhase(self.dim,x=0,y=2*h)) # magic
+            # else: # It is an X spider
+            #     self.add_to_phase(v1,CliffordPhase(self.dim,0,pow(-2*eo.had,-1,self.dim))) # more magic
+            new = Edge.get(had=0, simple=1)
+            self.graph[v1][v2] = new
+            self.graph[v2][v1] = new
+            if not old and v1 != v2: self.nedges += 1  # We have added a new edge
             return
-        if t1 == t2 and t1 == VertexType.Z:  # Both spiders are Z-spiders
-            if eo.simple != 0 or old.simple != 0: # We have some amount of simple edges, so the spiders 'fuse' and we can get rid of any H-edges
-                h = (old.had + eo.had) % self.dim
-                self.add_to_phase(v1,CliffordPhase(self.dim,x=0,y=2*h)) # magic
-                # else: # It is an X spider
-                #     self.add_to_phase(v1,CliffordPhase(self.dim,0,pow(-2*eo.had,-1,self.dim))) # more magic
-                new = Edge(had=0, simple = 1)
-                self.graph[v1][v2] = new
-                self.graph[v2][v1] = new
-                if not old: self.nedges += 1  # We have added a new edge
-                return
-
-            # no simple edges, so only H-edges
+
+        # no simple edges, so only H-edges
+        h = (eo.had + old.had) % self.dim
+        if h == 0: 
+            if old:  # There was an old edge, but no longer
+                self.remove_edge((v1,v2))
+            return  # No edge to add
+        new = Edge.get(had=h, simple=0)
+        self.graph[v1][v2] = new
+        self.graph[v2][v1] = new
+        if not old and v1 != v2: self.nedges += 1  # We have added a new edge
+
+    def _add_edge_xx(self, v1, v2, eo, old):
+        # Both spiders are X-spiders
+        if not eo.is_reduced():
+            raise ValueError("Complicated edge types are currently not supported for X-spiders")
+        if eo.is_had_edge():
+            if old and old.is_simple_edge():
+                raise ValueError("Adding H-edge to regular edge between X-spider: complicated edge types are currently not supported for X-spiders")
             h = (eo.had + old.had) % self.dim
             if h == 0: 
                 if old:  # There was an old edge, but no longer
-                    self.remove_edge(e)
+                    self.remove_edge((v1,v2))
                 return  # No edge to add
-            new = Edge(had=h,simple=0)
+            # Like between a Z- and an X-spider, the remaining H-edges collapse to 1
+            new = Edge.get(had=1, simple=0)
             self.graph[v1][v2] = new
             self.graph[v2][v1] = new
-            if not old: self.nedges += 1  # We have added a new edge
-            return
+            if not old and v1 != v2: self.nedges += 1  # We have added a new edge
+        else:  # eo is a simple edge
+            if old and old.is_had_edge():
+                raise ValueError("Adding H-edge to regular edge between X-spider: complicated edge types are currently not supported for X-spiders")
+            new = Edge.get(had=0, simple=1)  # Simple edges collapse to a single edge for X-X connections
+            self.graph[v1][v2] = new
+            self.graph[v2][v1] = new
+            if not old and v1 != v2: self.nedges += 1  # We have added a new edge
 
-        if t1 == VertexType.X and t2 == VertexType.X:  # Both X-spiders
-            if not eo.is_reduced():
-                raise ValueError("Complicated edge types are currently not supported for X-spiders")
-            if eo.is_had_edge():
-                if old and old.is_simple_edge():
-                    raise ValueError("Adding H-edge to regular edge between X-spider: complicated edge types are currently not supported for X-spiders")
-                h = (eo.had + old.had) % self.dim
-                if h == 0: 
-                    if old:  # There was an old edge, but no longer
-                        self.remove_edge(e)
-                    return  # No edge to add
-                new = Edge(had=h,simple=0)
-                self.graph[v1][v2] = new
-                self.graph[v2][v1] = new
-                if not old: self.nedges += 1  # We have added a new edge
-            else:  # eo is a simple edge
-                if old and old.is_had_edge():
-                    raise ValueError("Adding H-edge to regular edge between X-spider: complicated edge types are currently not supported for X-spiders")
-                new = Edge(had=0,simple=1)  # Simple edges collapse to a single edge for X-X connections
-                self.graph[v1][v2] = new
-                self.graph[v2][v1] = new
-                if not old: self.nedges += 1  # We have added a new edge
-                return
-
-        # We now know that one of them must be a Z spider and the other an X spider
+    def _add_edge_zx(self, v1, v2, eo, old):
+        # One of them is a Z spider and the other an X spider
         # This means that regular edges go modulo d, while Hadamard edges are collapsed to 1
         if not eo.is_reduced():
             raise ValueError("Complicated edge types are currently not supported for connections between Z- and X-spiders")
         if eo.is_simple_edge():
-            if old and old.is_hadamard_edge():
+            if old and old.is_had_edge():
                 raise ValueError("Adding simple edge to regular edge between Z- and X-spider: complicated edge types are currently not supported")
             s = (eo.simple + old.simple) % self.dim
             if s == 0: 
                 if old:  # There was an old edge, but no longer
-                    self.remove_edge(e)
+                    self.remove_edge((v1,v2))
                 return  # No edge to add
-            new = Edge(had=0,simple=s)
+            new = Edge.get(had=0, simple=s)
             self.graph[v1][v2] = new
             self.graph[v2][v1] = new
-            if not old: self.nedges += 1  # We have added a new edge
+            if not old and v1 != v2: self.nedges += 1  # We have added a new edge
         else:  # eo is an H-edge
             if old and old.is_simple_edge():
                 raise ValueError("Adding H-edge to regular edge between Z- and X-spider: complicated edge types are currently not supported")
-            new = Edge(had=1,simple=0)  # H-edges collapse to a single edge for Z-X connections
+            new = Edge.get(had=1, simple=0)  # H-edges collapse to a single edge for Z-X connections
             self.graph[v1][v2] = new
             self.graph[v2][v1] = new
-            if not old: self.nedges += 1  # We have added a new edge
-            return
+            if not old and v1 != v2: self.nedges += 1  # We have added a new edge
+
+    # add_edge dispatches on the pair of vertex types; any other pair is Z-X
+    _edge_adders = {
+        (VertexType.BOUNDARY, VertexType.BOUNDARY): _add_edge_boundary,
+        (VertexType.BOUNDARY, VertexType.Z): _add_edge_boundary,
+        (VertexType.BOUNDARY, VertexType.X): _add_edge_boundary,
+        (VertexType.Z, VertexType.BOUNDARY): _add_edge_boundary,
+        (VertexType.X, VertexType.BOUNDARY): _add_edge_boundary,
+        (VertexType.Z, VertexType.Z): _add_edge_zz,
+        (VertexType.X, VertexType.X): _add_edge_xx,
+    }
 
     def remove_vertices(self, vertices):
+        removed = set()
         for v in vertices:
             vs = list(self.graph[v])
             # remove all edges
             for v1 in vs:
-                self.nedges -= 1
                 del self.graph[v][v1]
                 if v != v1:
+                    self.nedges -= 1
                     del self.graph[v1][v]
             # remove the vertex
             del self.graph[v]
             del self.ty[v]
             del self._phase[v]
-            if v in self._inputs:
-                self._inputs = tuple(u for u in self._inputs if u != v)
-            if v in self._outputs:
-                self._outputs = tuple(u for u in self._outputs if u != v)
-            try: del self._qindex[v]
-            except: pass
-            try: del self._rindex[v]
-            except: pass
-            try: del self.phase_index[v]
-            except: pass
-        self._vindex = max(self.vertices(),default=0) + 1
+            if self._qindex.pop(v, None) == self._maxq: self._maxq_dirty = True
+            if self._rindex.pop(v, None) == self._maxr: self._maxr_dirty = True
+            removed.add(v)
+        if not removed.isdisjoint(self._inputs):
+            self._inputs = tuple(u for u in self._inputs if u not in removed)
+        if not removed.isdisjoint(self._outputs):
+            self._outputs = tuple(u for u in self._outputs if u not in removed)
+        # Only the removal of the last vertex can lower the index of the next one
+        if self._vindex - 1 in removed:
+            self._vindex = max(self.vertices(),default=0) + 1
 
     def remove_vertex(self, vertex):
         self.remove_vertices([vertex])
 
     def remove_edges(self, edges):
         for s,t in edges:
-            self.nedges -= 1
             del self.graph[s][t]
             if s != t:
+                self.nedges -= 1
                 del self.graph[t][s]
 
     def remove_edge(self, edge):
@@ -241,8 +278,8 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
         return len(self.graph)
 
     def num_edges(self):
-        #return self.nedges
-        return len(self.edge_set())
+        # Like edges(), this does not count self-loops
+        return self.nedges
 
     def vertices(self):
         return self.graph.keys()
@@ -276,13 +313,11 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
 
     def edge_object(self, e):
         v1,v2 = e
-        try:
-            return self.graph[v1][v2]
-        except KeyError:
-            return Edge(0,0)
+        return self.graph.get(v1, _NO_NEIGHBOURS).get(v2, _NO_EDGE)
 
     def set_edge_object(self, e, t):
         v1,v2 = e
+        if v1 != v2 and v2 not in self.graph[v1]: self.nedges += 1
         self.graph[v1][v2] = t
         self.graph[v2][v1] = t
 
@@ -294,13 +329,13 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
         self.ty[vertex] = t
 
     def phase(self, vertex):
-        return self._phase.get(vertex,CliffordPhase(self.dim))
+        return self._phase.get(vertex,CliffordPhase.zero(self.dim))
     def phases(self):
         return self._phase
     def set_phase(self, vertex, phase):
         self._phase[vertex] = phase
     def add_to_phase(self, vertex, phase):
-        old_phase = self._phase.get(vertex, CliffordPhase(self.dim))
+        old_phase = self._phase.get(vertex, CliffordPhase.zero(self.dim))
         self._phase[vertex] = old_phase + phase
     
     def qubit(self, vertex):
@@ -309,6 +344,8 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
         return self._qindex
     def set_qubit(self, vertex, q):
         if q > self._maxq: self._maxq = q
+        elif q < self._maxq and self._qindex.get(vertex) == self._maxq:
+            self._maxq_dirty = True
         self._qindex[vertex] = q
 
     def row(self, vertex):
@@ -317,5 +354,7 @@ class GraphS(BaseGraph[int,Tuple[int,int]]):
         return self._rindex
     def set_row(self, vertex, r):
         if r > self._maxr: self._maxr = r
+        elif r < self._maxr and self._rindex.get(vertex) == self._maxr:
+            self._maxr_dirty = True
         self._rindex[vertex] = r
 
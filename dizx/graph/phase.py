@@ -18,10 +18,12 @@
 
 from __future__ import annotations
 import abc
+import functools
 from cmath import exp, pi
 
 
 class Phase(abc.ABC):
+    __slots__ = ('_dim',)
 
     def __init__(self, dim: int) -> None:
         self._dim = dim
@@ -71,13 +73,32 @@ class Phase(abc.ABC):
         pass
 
 
+@functools.lru_cache(maxsize=4096)
+def _clifford_phase_value(dim: int, x: int, y: int) -> complex:
+    """The value sum_k omega^((x*k + y*k^2)/2) of a Clifford spider with no legs.
+    There are only dim*dim different values, so they are cached."""
+    omega = exp(1j * 2 * pi / dim)
+    ret = 0 + 0j
+    for k in range(dim):
+        ret += omega ** ((x * k + y * k * k) / 2)
+    return ret
+
+
 class CliffordPhase(Phase):
+    __slots__ = ('_x', '_y')
 
     def __init__(self, dim: int, x: int = 0, y: int = 0) -> None:
         super().__init__(dim)
         self._x = x % self.dim
         self._y = y % self.dim
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def zero(dim: int) -> CliffordPhase:
+        """Returns a shared zero phase of the given dimension. Phases are
+        never modified in place, so this instance can be reused freely."""
+        return CliffordPhase(dim)
+
     @property
     def x(self):
         return self._x
@@ -87,11 +108,7 @@ class CliffordPhase(Phase):
         return self._y
 
     def get_phase(self) -> complex:
-        omega = exp(1j * 2 * pi / self.dim)
-        ret = 0 + 0j
-        for k in range(self.dim):
-            ret += omega ** ((self._x * k + self._y * k * k) / 2)
-        return ret
+        return _clifford_phase_value(self.dim, self._x, self._y)
 
     def adjoint(self) -> CliffordPhase:
         return CliffordPhase(self.dim, -self.x, -self.y)
@@ -19,6 +19,7 @@
 
 import math
 import cmath
+import functools
 from fractions import Fraction
 
 from .phase import CliffordPhase, Phase
@@ -30,8 +31,15 @@ __all__ = ['Scalar']
 def cexp(val) -> complex:
     return cmath.exp(1j*math.pi*val)
 
+@functools.lru_cache(maxsize=None)
+def _inverse_powers_of_two(dim: int) -> tuple:
+    """Returns the inverses of 4 and 8 modulo ``dim``."""
+    return pow(2, -2, dim), pow(2, -3, dim)
+
 class Scalar(object):
     """Represents a global scalar for a Graph instance."""
+    __slots__ = ('dim', 'power_dim', 'phase', 'floatfactor', 'is_unknown', 'is_zero')
+
     def __init__(self, dim) -> None:
         self.dim = dim
         self.power_dim: int = 0 # Stores power of square root of the dimension
@@ -100,8 +108,9 @@ class Scalar(object):
         """Add the scalar corresponding to a connected pair of spiders (p1)-H-(p2)."""
         assert p1.y == 0
         self.add_power(1)
-        omega_pow = pow(2, -2, self.dim) * p1.x * p2.x + \
-                    pow(2, -3, self.dim) * pow(p1.x, 2, self.dim) * p2.y
+        inv4, inv8 = _inverse_powers_of_two(self.dim)
+        x1 = p1.x
+        omega_pow = (inv4 * x1 * p2.x + inv8 * x1 * x1 * p2.y) % self.dim
         self.add_phase(Fraction(2 * omega_pow, self.dim))
 
     def add_spider_pair(self, p1: Phase, p2: Phase) -> None:
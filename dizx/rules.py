@@ -1,7 +1,7 @@
 from . import Edge, CliffordPhase, Phase
 from .basicrules import _add_empty_vertex_between, _set_empty_vertex_between
 from .graph.base import BaseGraph, VT, ET
-from .utils import VertexType
+from .utils import VertexType, mod_inverse
 
 
 def _check_pivoting_base(g: BaseGraph[VT, ET], v: VT, w: VT) -> bool:
@@ -18,8 +18,8 @@ def check_pivoting_simplification(g: BaseGraph[VT, ET], v: VT, w: VT) -> bool:
     Note: this function assumes that the graph is graph-like.
     """
     return _check_pivoting_base(g, v, w)\
-        and all([g.type(n) == VertexType.Z for n in g.neighbors(v)])\
-        and all([g.type(n) == VertexType.Z for n in g.neighbors(w)])
+        and all(g.type(n) == VertexType.Z for n in g.neighbors(v))\
+        and all(g.type(n) == VertexType.Z for n in g.neighbors(w))
 
 
 def check_boundary_pivot_simplification(
@@ -49,33 +49,30 @@ def pivoting_simplification(g: BaseGraph[VT, ET], v: VT, w: VT) -> bool:
                          "with CliffordPhase phases.")
 
     epsilon = g.edge_object(g.edge(v, w)).had
-    epsilon_inv = pow(epsilon, -1, g.dim)
+    epsilon_inv = mod_inverse(epsilon, g.dim)
     _ns = set(g.neighbors(v)).union(g.neighbors(w))
     _ns.remove(v)
     _ns.remove(w)
     ns = list(_ns)
-    for n in ns:
-        e = g.edge_object(g.edge(v, n)).had
-        f = g.edge_object(g.edge(w, n)).had
+    # The edges to v and w don't change below, so look them up only once
+    es = [g.edge_object(g.edge(v, n)).had for n in ns]
+    fs = [g.edge_object(g.edge(w, n)).had for n in ns]
+    dim, edge, add_edge = g.dim, g.edge, g.add_edge
+    vpx, vpy = vp.x, vp.y
+    for n, e, f in zip(ns, es, fs):
         g.add_to_phase(n, CliffordPhase(
-            dim=g.dim,
-            x=-epsilon_inv * (vp.x * f + vp.y * e),
+            dim=dim,
+            x=-epsilon_inv * (vpx * f + vpy * e),
             y=-2 * epsilon_inv * f * e
         ))
 
-    for i, n in enumerate(ns):
-        for m in ns[i + 1:]:
-            e_1 = g.edge_object(g.edge(v, n)).had
-            e_2 = g.edge_object(g.edge(v, m)).had
-            f_1 = g.edge_object(g.edge(w, n)).had
-            f_2 = g.edge_object(g.edge(w, m)).had
-            g.add_edge(g.edge(n, m), Edge.make(
-                dim=g.dim,
-                had=-epsilon_inv * (e_1 * f_2 + e_2 * f_1)
-            ))
+    for i, (n, e_1, f_1) in enumerate(zip(ns, es, fs), 1):
+        for m, e_2, f_2 in zip(ns[i:], es[i:], fs[i:]):
+            had = (-epsilon_inv * (e_1 * f_2 + e_2 * f_1)) % dim
+            if had:  # Adding an empty edge does nothing
+                add_edge(edge(n, m), Edge.get(had=had))
 
-    g.remove_vertex(v)
-    g.remove_vertex(w)
+    g.remove_vertices([v, w])
 
     return True
 
@@ -88,7 +85,7 @@ def unfuse_phase(g: BaseGraph[VT, ET], v: VT) -> VT:
     )
     g.add_edge(g.edge(v, new), Edge(simple=1))
     g.set_phase(new, g.phase(v))
-    g.set_phase(v, CliffordPhase(g.dim))
+    g.set_phase(v, CliffordPhase.zero(g.dim))
     return new
 
 
@@ -132,7 +129,7 @@ def check_local_complementation_simplification(
     """
 
     return g.type(v) == VertexType.Z and g.phase(v).is_strictly_clifford()\
-        and all([g.type(n) == VertexType.Z for n in g.neighbors(v)])
+        and all(g.type(n) == VertexType.Z for n in g.neighbors(v))
 
 
 def local_complementation_simplification(
@@ -145,23 +142,24 @@ def local_complementation_simplification(
             "The implementation of local complementation is only "
             "supported with CliffordPhase phases.")
 
-    z_inv = pow(vp.y, -1, g.dim)
+    z_inv = mod_inverse(vp.y, g.dim)
     ns = list(g.neighbors(v))
+    es = [g.edge_object(g.edge(v, n)).had for n in ns]
 
-    for n in ns:
-        e = g.edge_object(g.edge(v, n)).had
+    dim, edge, add_edge = g.dim, g.edge, g.add_edge
+    vpx = vp.x
+    for n, e in zip(ns, es):
         g.add_to_phase(n, CliffordPhase(
-            dim=g.dim,
-            x=-z_inv * vp.x * e,
+            dim=dim,
+            x=-z_inv * vpx * e,
             y=-z_inv * (e ** 2)
         ))
 
-    for i, n in enumerate(ns):
-        for m in ns[i + 1:]:
-            e_n = g.edge_object(g.edge(v, n)).had
-            e_m = g.edge_object(g.edge(v, m)).had
-            g.add_edge(g.edge(n, m),
-                       Edge.make(dim=g.dim, had=-z_inv * e_n * e_m))
+    for i, (n, e_n) in enumerate(zip(ns, es), 1):
+        for m, e_m in zip(ns[i:], es[i:]):
+            had = (-z_inv * e_n * e_m) % dim
+            if had:  # Adding an empty edge does nothing
+                add_edge(edge(n, m), Edge.get(had=had))
 
     g.remove_vertex(v)
 
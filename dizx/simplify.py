@@ -1,10 +1,12 @@
+import heapq
 import itertools
-from typing import Optional
+from typing import Mapping, Optional
 
 from . import Edge
 from .graph.base import BaseGraph, VT, ET
 from .rules import local_complementation_simplification,\
-    pivoting_simplification, boundary_pivoting
+    pivoting_simplification, boundary_pivoting,\
+    check_local_complementation_simplification, check_pivoting_simplification
 from .utils import VertexType
 from .basicrules import x_color_change, _add_empty_vertex_between, z_fuse,\
     remove_self_loop_on_z, remove_parallel_edge_between_zs
@@ -27,47 +29,65 @@ def has_self_loop(g: BaseGraph[VT, ET]) -> bool:
 
 def is_gh(g: BaseGraph[VT, ET]) -> bool:
     """Check if a graph has only Z spiders that are connected via H-edges"""
+    ty = g.types()
     for v in g.vertices():
-        if g.type(v) not in [VertexType.Z, VertexType.BOUNDARY]:
+        if ty[v] not in (VertexType.Z, VertexType.BOUNDARY):
             return False
 
-    for v1, v2 in itertools.combinations(g.vertices(), 2):
-        if not g.connected(v1, v2):
-            continue
-
-        if g.type(v1) != VertexType.BOUNDARY and g.type(
-                v2) != VertexType.BOUNDARY\
-                and g.edge_object(g.edge(v1, v2)).is_simple_edge():
+    for e in g.edges():
+        v1, v2 = g.edge_st(e)
+        if ty[v1] != VertexType.BOUNDARY and ty[v2] != VertexType.BOUNDARY\
+                and g.edge_object(e).is_simple_edge():
             return False
 
     return True
 
 
 def io_connections_are_graph_like(g: BaseGraph[VT, ET]) -> bool:
-    bs = [v for v in g.vertices() if g.type(v) == VertexType.BOUNDARY]
+    ty = g.types()
+    bs = [v for v in g.vertices() if ty[v] == VertexType.BOUNDARY]
     for b in bs:
-        [z] = list(g.neighbors(b))
-        b_neighbors =\
-            [n for n in g.neighbors(z) if g.type(n) == VertexType.BOUNDARY]
-        if len(b_neighbors) > 1:
+        [z] = g.neighbors(b)
+        if sum(1 for n in g.neighbors(z) if ty[n] == VertexType.BOUNDARY) > 1:
             return False
     return True
 
 
 def z_spiders_connected_to_single_io(g: BaseGraph[VT, ET]) -> bool:
-    zs = [v for v in g.vertices() if g.type(v) == VertexType.Z]
+    ty = g.types()
+    zs = [v for v in g.vertices() if ty[v] == VertexType.Z]
     for z in zs:
-        b_neighbors =\
-            [n for n in g.neighbors(z) if g.type(n) == VertexType.BOUNDARY]
-        if len(b_neighbors) > 1:
+        if sum(1 for n in g.neighbors(z) if ty[n] == VertexType.BOUNDARY) > 1:
             return False
+    return True
 
 
 def is_graph_like(g: BaseGraph[VT, ET]) -> bool:
     """Checks if a ZX-diagram is graph-like"""
-    return is_gh(g)\
-        and not (has_self_loop(g))\
-        and io_connections_are_graph_like(g)
+    # Does the checks of is_gh, has_self_loop and io_connections_are_graph_like
+    # in one pass over the vertices and one over the edges.
+    ty = g.types()
+    for v in g.vertices():
+        t = ty[v]
+        if t != VertexType.Z and t != VertexType.BOUNDARY\
+                or g.connected(v, v):
+            return False
+        if t == VertexType.BOUNDARY and g.vertex_degree(v) != 1:
+            return False
+
+    # The number of boundaries connected to each vertex
+    boundary_count: dict = {}
+    for e in g.edges():
+        v1, v2 = g.edge_st(e)
+        b1 = ty[v1] == VertexType.BOUNDARY
+        b2 = ty[v2] == VertexType.BOUNDARY
+        if b1:
+            boundary_count[v2] = boundary_count.get(v2, 0) + 1
+        if b2:
+            boundary_count[v1] = boundary_count.get(v1, 0) + 1
+        if not b1 and not b2 and g.edge_object(e).is_simple_edge():
+            return False
+    return all(n <= 1 for n in boundary_count.values())
 
 
 def to_graph_like(g: BaseGraph[VT, ET]) -> None:
@@ -76,30 +96,37 @@ def to_graph_like(g: BaseGraph[VT, ET]) -> None:
     # turn all red spiders into green spiders
     to_gh(g)
 
+    # the later passes only remove Z-spiders and add new ones next to the
+    # boundaries, so both lists are made once
+    ty = g.types()
+    zs = [v for v in g.vertices() if ty[v] == VertexType.Z]
+    bs = [v for v in g.vertices() if ty[v] == VertexType.BOUNDARY]
+
     # simplify: fuse along non-HAD edges
-    fuse_along_simple_edges(g)
+    fuse_along_simple_edges(g, zs)
 
     #  remove self-loops
-    for v in g.vertices():
-        # if there's no self-loop, the function does nothing
+    for v in [v for v in g.vertices() if g.connected(v, v)]:
         remove_self_loop_on_z(g, v)
 
     #  remove parallel edges
-    for e in g.edges():
-        # if there are no parallel edges, the function does nothing
-        remove_parallel_edge_between_zs(g, *e)
+    parallel = [e for e in g.edges() if not g.edge_object(e).is_reduced()]
+    for e in parallel:
+        # an earlier fusion can remove the edge, then this does nothing
+        remove_parallel_edge_between_zs(g, *g.edge_st(e))
 
     # each Z-spider can only be connected to at most 1 I/O
-    unfuse_multi_boundary_connections(g)
+    ty = g.types()
+    unfuse_multi_boundary_connections(g, [v for v in zs if v in ty])
 
     # ensure all I/O are connected to a Z-spider
-    bs = [v for v in g.vertices() if g.type(v) == VertexType.BOUNDARY]
+    ty = g.types()
     for v in bs:
         # have to connect the (boundary) vertex to a Z-spider
-        [n] = list(g.neighbors(v))
+        [n] = g.neighbors(v)
         if g.edge_object(g.edge(v, n)).is_had_edge()\
-                or g.type(n) == VertexType.BOUNDARY:
-            _add_vertices_before_boundary(g, v, n)
+                or ty[n] == VertexType.BOUNDARY:
+            _add_vertices_before_boundary(g, v, n, ty)
 
     # make drawings nice
     g.ensure_enough_distance()
@@ -107,39 +134,48 @@ def to_graph_like(g: BaseGraph[VT, ET]) -> None:
     assert is_graph_like(g)
 
 
-def fuse_along_simple_edges(g):
-    zs = [v for v in g.vertices() if g.type(v) == VertexType.Z]
-    fused_zs = []
+def fuse_along_simple_edges(
+        g: BaseGraph[VT, ET], zs: Optional[list[VT]] = None) -> None:
+    ty = g.types()
+    if zs is None:
+        zs = [v for v in g.vertices() if ty[v] == VertexType.Z]
+    fused_zs = set()
     for z in zs:
         if z in fused_zs:
             continue
-        ns = [v for v in g.neighbors(z) if g.type(v) == VertexType.Z]
-        fused_zs += [
+        ns = [v for v in g.neighbors(z) if ty[v] == VertexType.Z]
+        fused_zs.update(
             n for n in ns if
             z_fuse(g, z, n)
-        ]
+        )
 
 
-def unfuse_multi_boundary_connections(g: BaseGraph[VT, ET]) -> None:
-    zs = [v for v in g.vertices() if g.type(v) == VertexType.Z]
+def unfuse_multi_boundary_connections(
+        g: BaseGraph[VT, ET], zs: Optional[list[VT]] = None) -> None:
+    ty = g.types()
+    if zs is None:
+        zs = [v for v in g.vertices() if ty[v] == VertexType.Z]
     for v in zs:
         boundary_ns = [n for n in g.neighbors(v) if
-                       g.type(n) == VertexType.BOUNDARY]
+                       ty[n] == VertexType.BOUNDARY]
         if len(boundary_ns) <= 1:
             continue
 
         # add dummy spiders for all but one
         for b in boundary_ns[:-1]:
-            _add_vertices_before_boundary(g, b, v)
+            _add_vertices_before_boundary(g, b, v, ty)
 
 
-def _add_vertices_before_boundary(g: BaseGraph[VT, ET], v: VT, w: VT) -> None:
-    e = g.edge_object(g.edge(w, v))
-    g.remove_edge(g.edge(w, v))
-    n = (g.type(v) == VertexType.BOUNDARY) + (g.type(w) == VertexType.BOUNDARY)
+def _add_vertices_before_boundary(
+        g: BaseGraph[VT, ET], v: VT, w: VT,
+        ty: Mapping[VT, VertexType.Type]) -> None:
+    edge = g.edge(w, v)
+    e = g.edge_object(edge)
+    g.remove_edge(edge)
+    n = (ty[v] == VertexType.BOUNDARY) + (ty[w] == VertexType.BOUNDARY)
     assert n > 0
-    new_z_1 = _add_z_neighbour_if_boundary(g, v, w, n)
-    new_z_2 = _add_z_neighbour_if_boundary(g, w, v, n)
+    new_z_1 = _add_z_neighbour_if_boundary(g, v, w, n, ty)
+    new_z_2 = _add_z_neighbour_if_boundary(g, w, v, n, ty)
     # n1 can be 0, so use `is None`!
     z_1: VT = v if new_z_1 is None else new_z_1
     z_2: VT = w if new_z_2 is None else new_z_2
@@ -152,13 +188,15 @@ def _add_vertices_before_boundary(g: BaseGraph[VT, ET], v: VT, w: VT) -> None:
 
 
 def _add_z_neighbour_if_boundary(
-        g: BaseGraph[VT, ET], b: VT, w: VT, n: int
+        g: BaseGraph[VT, ET], b: VT, w: VT, n: int,
+        ty: Mapping[VT, VertexType.Type]
 ) -> Optional[VT]:
-    if g.type(b) == VertexType.BOUNDARY:
+    if ty[b] == VertexType.BOUNDARY:
+        qb, rb = g.qubit(b), g.row(b)
         new = g.add_vertex(
             VertexType.Z,
-            qubit=((1 + n) * g.qubit(b) + g.qubit(w)) / (2 + n) or g.qubit(b),
-            row=((1 + n) * g.row(b) + g.row(w)) / (2 + n) or g.row(b)
+            qubit=((1 + n) * qb + g.qubit(w)) / (2 + n) or qb,
+            row=((1 + n) * rb + g.row(w)) / (2 + n) or rb
         )
         g.add_edge(g.edge(b, new), Edge(simple=1))
         return new
@@ -166,46 +204,102 @@ def _add_z_neighbour_if_boundary(
 
 
 def simplify_lc(g: BaseGraph[VT, ET]) -> bool:
-    for v in g.vertices():
-        if local_complementation_simplification(g, v):
-            simplify_lc(g)
-            return True
-    return False
-
-
-def simplify_pivot(g: BaseGraph[VT, ET]):
+    # Like simplify_pivot, this complements the first vertex, by position,
+    # that allows it. A local complementation only changes the phases and
+    # edges of the neighbours of v, so only those are queued again.
     vertices = list(g.vertices())
-    for i, v in enumerate(vertices):
-        for w in vertices[i + 1:]:
-            if pivoting_simplification(g, v, w):
-                simplify_pivot(g)
-                return True
-    return False
-
-
-def simplify_boundary_pivot(g: BaseGraph[VT, ET]):
+    pos = {v: i for i, v in enumerate(vertices)}
+    queue = list(range(len(vertices)))
+    queued = set(queue)
+    complemented = False
+    while queue:
+        i = heapq.heappop(queue)
+        queued.remove(i)
+        v = vertices[i]
+        if not check_local_complementation_simplification(g, v):
+            continue
+        ns = list(g.neighbors(v))
+        local_complementation_simplification(g, v)
+        complemented = True
+        for n in ns:
+            j = pos[n]
+            if j not in queued:
+                queued.add(j)
+                heapq.heappush(queue, j)
+    return complemented
+
+
+def simplify_pivot(g: BaseGraph[VT, ET]) -> bool:
+    # Pivots are applied in the same order as a scan over all pairs (v,w) of
+    # g.vertices() that restarts after every pivot: the first pair, by
+    # position, that can be pivoted. Only pairs that touch the neighbourhood
+    # of a pivot can change whether they are pivotable, so only those are
+    # queued again instead of rescanning the graph.
     vertices = list(g.vertices())
-    for i, v in enumerate(vertices):
-        for w in vertices[i + 1:]:
-            if boundary_pivoting(g, v, w) or boundary_pivoting(g, v, w):
-                simplify_boundary_pivot(g)
-                return True
-    return False
+    pos = {v: i for i, v in enumerate(vertices)}
+
+    def pairs(vs):
+        for v in vs:
+            i = pos[v]
+            for w in g.neighbors(v):
+                j = pos[w]
+                if i < j:
+                    yield (i, j)
+                elif j < i:
+                    yield (j, i)
+
+    queued = set(pairs(vertices))
+    queue = list(queued)
+    heapq.heapify(queue)
+    removed = set()
+    pivoted = False
+    while queue:
+        p = heapq.heappop(queue)
+        queued.remove(p)
+        v, w = vertices[p[0]], vertices[p[1]]
+        if v in removed or w in removed\
+                or not check_pivoting_simplification(g, v, w):
+            continue
+        ns = set(g.neighbors(v)).union(g.neighbors(w))
+        ns.difference_update((v, w))
+        pivoting_simplification(g, v, w)
+        removed.update((v, w))
+        pivoted = True
+        for p in pairs(ns):
+            if p not in queued:
+                queued.add(p)
+                heapq.heappush(queue, p)
+    return pivoted
+
+
+def simplify_boundary_pivot(g: BaseGraph[VT, ET]) -> bool:
+    # Rescans from the first pair after every boundary pivot, as each one
+    # adds vertices next to the boundary.
+    pivoted = False
+    while True:
+        for v, w in itertools.combinations(list(g.vertices()), 2):
+            if boundary_pivoting(g, v, w):
+                pivoted = True
+                break
+        else:
+            return pivoted
 
 
 def _internal_spiders(g: BaseGraph[VT, ET]) -> list[VT]:
+    ty = g.types()
     return [
         v for v in g.vertices() if
-        g.type(v) == VertexType.Z and not [n for n in g.neighbors(v) if
-                                           g.type(n) == VertexType.BOUNDARY]
+        ty[v] == VertexType.Z and not any(ty[n] == VertexType.BOUNDARY
+                                          for n in g.neighbors(v))
     ]
 
 
 def _boundary_spiders(g: BaseGraph[VT, ET]) -> list[VT]:
+    ty = g.types()
     return [
         v for v in g.vertices() if
-        g.type(v) == VertexType.Z and [n for n in g.neighbors(v) if
-                                       g.type(n) == VertexType.BOUNDARY]
+        ty[v] == VertexType.Z and any(ty[n] == VertexType.BOUNDARY
+                                      for n in g.neighbors(v))
     ]
 
 
@@ -214,8 +308,7 @@ def is_in_ap_form(g: BaseGraph[VT, ET]) -> bool:
     return is_graph_like(g)\
         and all(g.phase(v).is_pauli() for v in internals)\
         and not any(
-            set(g.neighbors(v)).intersection(internals)
-            for v in internals
+            n in internals for v in internals for n in g.neighbors(v)
         )
 
 
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import os
+import functools
 from argparse import ArgumentTypeError
 from fractions import Fraction
 from typing import Union, Optional, List, Dict, Any
@@ -32,6 +33,12 @@ class VertexType:
     Z: Final = 1
     X: Final = 2
 
+@functools.lru_cache(maxsize=8192)
+def mod_inverse(x: int, dim: int) -> int:
+    """Returns the inverse of ``x`` modulo ``dim``. Raises a ValueError
+    if ``x`` is not invertible."""
+    return pow(x, -1, dim)
+
 def toggle_vertex(ty: VertexType.Type) -> VertexType.Type:
     """Swap the X and Z vertex types."""
     if not vertex_is_zx(ty):